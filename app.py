@@ -2,21 +2,17 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone, timedelta, date
+import os
 import pandas as pd
 import streamlit as st
 from streamlit_autorefresh import st_autorefresh
 
 from src.fomc_calendar import get_upcoming_meeting
-from src.kalshi_discovery import rank_fomc_series
-from src.kalshi_client import (
-    list_events,
-    choose_event_for_date,
-    get_event_with_markets,
-    parse_markets,
-    classify_fed_decision_market_title,
-)
+from src.kalshi_discovery import SeriesCatalog, rank_fomc_series
 from src.futures_client import fed_funds_futures_symbol, fetch_quotes
 from src.model import futures_to_probs, kalshi_probs_to_action_buckets
+from src.config import load_config
+from src.live import LiveService, fetch_kalshi_snapshot, resolve_event
 from src import db as dbmod
 
 KALSHI_BASE = "https://api.elections.kalshi.com/trade-api/v2"
@@ -38,7 +34,15 @@ next_meeting = get_upcoming_meeting(today=today_utc)
 auto_meeting_decision_date = next_meeting.end_date
 auto_effective_from = (datetime(next_meeting.year, next_meeting.month, next_meeting.end_day) + timedelta(days=1)).date()
 
-auto_series_candidates = rank_fomc_series(KALSHI_BASE, top_n=12)
+@st.cache_resource
+def series_catalog() -> SeriesCatalog:
+    # Persisted in SQLite; refresh() below only hits /series once the TTL has lapsed.
+    return SeriesCatalog(KALSHI_BASE, conn=dbmod.connect(SQLITE_PATH))
+
+catalog = series_catalog()
+auto_series_candidates = rank_fomc_series(KALSHI_BASE, top_n=12, catalog=catalog)
+if catalog.last_error:
+    st.warning(f"Kalshi series discovery: {catalog.last_error} (using {len(catalog)} cached series)")
 
 auto_fut_y, auto_fut_m = next_meeting.year, next_meeting.month
 auto_prior_y, auto_prior_m = (auto_fut_y - 1, 12) if auto_fut_m == 1 else (auto_fut_y, auto_fut_m - 1)
@@ -70,6 +74,8 @@ with st.sidebar:
     st.subheader("Kalshi series")
     st.caption("Force the correct one if needed. For Fed decision, use KXFEDDECISION.")
     series_override = st.text_input("Force Kalshi series ticker", value="KXFEDDECISION")
+    if auto_series_candidates:
+        st.caption("Discovered: " + ", ".join(auto_series_candidates[:6]))
 
     st.subheader("Futures symbols (override if Yahoo fails)")
     meeting_sym_default = fed_funds_futures_symbol(fut_y, fut_m)
@@ -77,45 +83,98 @@ with st.sidebar:
     meeting_sym = st.text_input("Meeting-month futures symbol", value=meeting_sym_default)
     prior_sym = st.text_input("Prior-month futures symbol", value=prior_sym_default)
 
-    edge_threshold = float(st.number_input("Edge threshold", value=0.03, step=0.01))
     step = float(st.number_input("Rate step (25bp = 0.25)", value=0.25, step=0.125))
-
-def _try_kalshi_for_series(series_ticker: str, target_date: date):
-    events = list_events(KALSHI_BASE, series_ticker=series_ticker, status=None)
-    event_ticker, event_title = choose_event_for_date(events, target=target_date)
-    payload = get_event_with_markets(KALSHI_BASE, event_ticker=event_ticker)
-    markets = parse_markets(payload)
-
-    probs = {}
-    rows = []
-    for m in markets:
-        cls = classify_fed_decision_market_title(m.title)
-        p = m.mid_prob
-        if cls is not None and p is not None:
-            probs[cls] = p
-        rows.append({"ticker": m.ticker, "title": m.title, "status": m.status, "mid_prob": p})
-
-    return series_ticker, event_ticker, event_title, probs, pd.DataFrame(rows)
-
+    sparkline_ticks = int(st.number_input("Sparkline length (ticks)", value=240, min_value=10, step=10))
+
+def _server_settings():
+    # ARB_* settings from the environment, overridden by .streamlit/secrets.toml if present.
+    try:
+        secrets = dict(st.secrets)
+    except Exception:
+        secrets = {}
+    return {**os.environ, **secrets}
+
+@st.cache_resource
+def live_service() -> LiveService:
+    # One poller per server process; it records ticks and raises alerts with no page open.
+    cfg = load_config(_server_settings(), kalshi_base_url=KALSHI_BASE, sqlite_path=SQLITE_PATH)
+    svc = LiveService(cfg)
+    svc.start()
+    return svc
+
+def _markets_df(markets) -> pd.DataFrame:
+    return pd.DataFrame([{"ticker": m.ticker, "title": m.title, "status": m.status, "mid_prob": m.mid_prob} for m in markets])
+
+# Page-local loaders: only used when the sidebar inputs differ from what the poller tracks.
 @st.cache_data(ttl=15)
 def load_kalshi_snapshot(target_date: date, forced_series: str):
-    return _try_kalshi_for_series(forced_series.strip(), target_date)
+    series_ticker = forced_series.strip()
+    event_ticker, event_title = resolve_event(KALSHI_BASE, series_ticker, target_date)
+    snap = fetch_kalshi_snapshot(KALSHI_BASE, series_ticker, event_ticker, event_title)
+    return series_ticker, event_ticker, event_title, snap.probs, _markets_df(snap.markets)
 
 @st.cache_data(ttl=15)
 def load_futures_quotes(meeting_symbol: str, prior_symbol: str):
     return fetch_quotes({"meeting_month": meeting_symbol.strip(), "prior_month": prior_symbol.strip()})
 
-# --- Kalshi ---
-try:
-    series_used, event_ticker, event_title, kalshi_probs_raw, kalshi_markets_df = load_kalshi_snapshot(
-        meeting_date, series_override
+svc = live_service()
+history = svc.history
+engine = svc.engine
+
+with st.sidebar:
+    st.subheader("Alerts (server-wide)")
+    alert_params = engine.params
+    st.caption(
+        f"Entry {alert_params.entry_threshold:.3f} · exit {alert_params.exit_threshold:.3f} · "
+        f"persist {alert_params.min_persist_ticks} ticks · cooldown {alert_params.cooldown_s:.0f}s · webhook {svc.cfg.alert_webhook_url or 'local stub'}"
+    )
+    st.caption(f"Poller tracking `{svc.event_ticker or '…'}`, last poll {svc.last_poll_utc or 'pending'}")
+    st.caption("Set via ARB_* env vars or secrets.toml (e.g. ARB_EDGE_THRESHOLD, ARB_ALERT_WEBHOOK_URL).")
+    st.subheader("This page only")
+    edge_threshold = float(
+        st.number_input("Edge threshold (events not live-tracked)", value=float(alert_params.entry_threshold), step=0.01)
     )
-except Exception as e:
-    st.error(f"Kalshi error: {e}")
-    st.stop()
 
-# --- Futures ---
-quotes = load_futures_quotes(meeting_sym, prior_sym)
+# Read the poller's last poll together with its alert state and tick edges, under one lock,
+# so the tables below and the Signals label/edge all come from the same poll.
+with history.lock:
+    live = svc.latest
+    live_active = engine.active()
+    live_edges = {}
+    if live is not None:
+        for o in history.outcomes(live.kalshi.event_ticker):
+            tick = history[(live.kalshi.event_ticker, o)].last()
+            if tick is not None:
+                live_edges[o] = float(tick["edge"])
+
+live_tracked = live is not None and (
+    series_override.strip() == live.kalshi.series_ticker
+    and meeting_date == live.meeting.end_date
+    and effective_from == live.effective_from
+    and (fut_y, fut_m) == (live.futures_year, live.futures_month)
+    and meeting_sym.strip() == live.meeting_symbol
+    and prior_sym.strip() == live.prior_symbol
+    and step == live.rate_step
+)
+
+if live_tracked:
+    snap = live.kalshi
+    series_used, event_ticker, event_title = snap.series_ticker, snap.event_ticker, snap.event_title
+    kalshi_probs_raw, kalshi_markets_df = snap.probs, _markets_df(snap.markets)
+    quotes = live.quotes
+else:
+    st.caption("Inputs differ from the background poller: quotes are fetched for this page and signals are not live-tracked.")
+    # --- Kalshi ---
+    try:
+        series_used, event_ticker, event_title, kalshi_probs_raw, kalshi_markets_df = load_kalshi_snapshot(
+            meeting_date, series_override
+        )
+    except Exception as e:
+        st.error(f"Kalshi error: {e}")
+        st.stop()
+
+    # --- Futures ---
+    quotes = load_futures_quotes(meeting_sym, prior_sym)
 q_meeting = quotes["meeting_month"]
 q_prior = quotes["prior_month"]
 
@@ -130,14 +189,17 @@ if meeting_month_avg is None or prior_month_avg is None:
 
 pre_rate_mid = float(prior_month_avg)
 
-fut = futures_to_probs(
-    month_avg_rate=float(meeting_month_avg),
-    pre_rate_mid=pre_rate_mid,
-    meeting_month_year=int(fut_y),
-    meeting_month=int(fut_m),
-    effective_from=effective_from,
-    step=float(step),
-)
+if live_tracked:
+    fut = live.fut
+else:
+    fut = futures_to_probs(
+        month_avg_rate=float(meeting_month_avg),
+        pre_rate_mid=pre_rate_mid,
+        meeting_month_year=int(fut_y),
+        meeting_month=int(fut_m),
+        effective_from=effective_from,
+        step=float(step),
+    )
 
 col1, col2 = st.columns([1.2, 1])
 
@@ -174,20 +236,66 @@ cmp["Edge (Futures - Kalshi)"] = cmp["Futures"] - cmp["Kalshi"]
 st.subheader("Probability comparison (Kalshi vs futures-implied)")
 st.dataframe(cmp, use_container_width=True)
 
-signals = []
-for outcome, row in cmp.iterrows():
-    edge = float(row["Edge (Futures - Kalshi)"])
-    if edge > edge_threshold:
-        signals.append((outcome, "Kalshi looks cheap", edge))
-    elif edge < -edge_threshold:
-        signals.append((outcome, "Kalshi looks rich", edge))
+st.subheader("Recent edge (in-memory history)")
+event_outcomes = history.outcomes(event_ticker)
+if not event_outcomes:
+    st.caption(f"No live history for `{event_ticker}`; the background poller tracks `{svc.event_ticker or '…'}`.")
+spark_cols = st.columns(max(1, len(event_outcomes)))
+for col, outcome in zip(spark_cols, event_outcomes):
+    with history.lock:
+        buf = history[(event_ticker, outcome)]
+        n_ticks = len(buf)
+        w = buf.window(sparkline_ticks).copy()
+        z = buf.zscore("edge", window=20)
+        mean20 = buf.rolling_mean("edge", window=20)
+        vol20 = buf.rolling_std("edge", window=20)
+    with col:
+        st.caption(f"{outcome} ({n_ticks} ticks)")
+        st.line_chart(pd.Series(w["edge"], index=pd.to_datetime(w["ts"], unit="s", utc=True)), height=120)
+        if len(z):
+            st.caption(f"mean20 {mean20[-1]:+.4f} · vol20 {vol20[-1]:.4f} · z {z[-1]:+.2f}")
+
+if live_tracked:
+    # Label and edge both come from the poller's last tick for this event.
+    signals = [
+        (outcome, sig, live_edges[outcome], "live (server alert state)")
+        for (event, outcome), sig in live_active.items()
+        if event == event_ticker and outcome in live_edges
+    ]
+else:
+    signals = []
+    for outcome, row in cmp.iterrows():
+        edge = float(row["Edge (Futures - Kalshi)"])
+        if edge > edge_threshold:
+            signals.append((outcome, "Kalshi looks cheap", edge, "not live-tracked (page threshold)"))
+        elif edge < -edge_threshold:
+            signals.append((outcome, "Kalshi looks rich", edge, "not live-tracked (page threshold)"))
 
 st.subheader("Signals")
 if signals:
-    st.table(pd.DataFrame(signals, columns=["Outcome", "Signal", "Edge"]))
+    st.table(pd.DataFrame(signals, columns=["Outcome", "Signal", "Edge", "Source"]))
 else:
     st.write("No signals beyond threshold.")
 
+st.subheader("Alerts")
+# The poller thread appends to these deques; copy before iterating.
+latencies = list(engine.latencies_ms)
+recent_alerts = list(engine.recent)
+if latencies:
+    worst = max(latencies)
+    st.caption(f"Quote-arrival-to-alert latency: last {latencies[-1]:.2f} ms · worst {worst:.2f} ms · over budget {engine.over_budget}")
+    if worst > engine.params.latency_budget_ms:
+        st.warning(f"Alert latency exceeded {engine.params.latency_budget_ms:.0f} ms budget.")
+sink_errors = list(engine.sink_errors) + [e for sink in engine.sinks for e in getattr(sink, "errors", [])]
+if sink_errors:
+    st.warning("Alert sink errors: " + " | ".join(sink_errors[-5:]))
+if svc.errors:
+    st.warning("Quote poller errors: " + " | ".join(list(svc.errors)[-3:]))
+if recent_alerts:
+    st.dataframe(pd.DataFrame([a.as_dict() for a in reversed(recent_alerts)]), use_container_width=True, height=240)
+else:
+    st.write("No alerts yet.")
+
 dbmod.insert_snapshot(conn, now_utc_iso, "kalshi", {f"kalshi_{k}": v for k, v in kalshi_actions.items()})
 dbmod.insert_snapshot(conn, now_utc_iso, "futures", {f"fut_{k}": v for k, v in fut.probs.items()})
 dbmod.insert_snapshot(conn, now_utc_iso, "misc", {"implied_post_rate": fut.implied_post_rate})
@@ -1,5 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import date
+from typing import Any, Mapping, Optional
+import os
+
+ENV_PREFIX = "ARB_"
 
 @dataclass(frozen=True)
 class Config:
@@ -24,5 +28,34 @@ class Config:
     # Signal threshold: how far probabilities must differ to flag an “edge”
     edge_threshold: float = 0.03
 
+    # Live alert pipeline (src/live.py). Server-wide: every viewer sees the same alerts.
+    poll_interval_s: float = 5.0
+    futures_poll_interval_s: float = 60.0
+    alert_exit_threshold: float = 0.015   # hysteresis: exit once |edge| drops below this
+    alert_min_persist_ticks: int = 2
+    alert_cooldown_s: float = 60.0
+    alert_latency_budget_ms: float = 100.0
+    alert_webhook_url: str = ""           # blank = in-process stub
+
     # SQLite file
     sqlite_path: str = "data.sqlite"
+
+def load_config(source: Optional[Mapping[str, Any]] = None, **overrides: Any) -> Config:
+    """Config defaults, overridden by ARB_<FIELD> entries (e.g. ARB_ALERT_WEBHOOK_URL) in `source`.
+
+    `source` defaults to os.environ; explicit keyword `overrides` win over both.
+    """
+    source = os.environ if source is None else source
+    kwargs = {}
+    for f in fields(Config):
+        key = ENV_PREFIX + f.name.upper()
+        if key not in source:
+            continue
+        raw = source[key]
+        default_type = type(f.default)
+        if default_type is date:
+            kwargs[f.name] = raw if isinstance(raw, date) else date.fromisoformat(str(raw))
+        else:
+            kwargs[f.name] = default_type(raw)
+    kwargs.update(overrides)
+    return Config(**kwargs)
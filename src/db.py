@@ -1,5 +1,5 @@
 import sqlite3
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 def connect(path: str) -> sqlite3.Connection:
     return sqlite3.connect(path, check_same_thread=False)
@@ -18,6 +18,33 @@ def init(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS alerts (
+            ts_utc TEXT NOT NULL,
+            event_ticker TEXT NOT NULL,
+            outcome TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            signal TEXT NOT NULL,
+            edge REAL,
+            kalshi_mid REAL,
+            futures_prob REAL,
+            implied_post_rate REAL,
+            latency_ms REAL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS series_catalog (
+            ticker TEXT PRIMARY KEY,
+            title TEXT,
+            category TEXT,
+            updated_at TEXT NOT NULL,
+            fetched_at TEXT NOT NULL
+        )
+        """
+    )
     conn.commit()
 
 def insert_snapshot(conn: sqlite3.Connection, ts_utc: str, source: str, payload: Dict[str, Any]) -> None:
@@ -28,3 +55,50 @@ def insert_snapshot(conn: sqlite3.Connection, ts_utc: str, source: str, payload:
             (ts_utc, source, k, float(v) if v is not None else None, None),
         )
     conn.commit()
+
+def insert_alert(conn: sqlite3.Connection, alert: Dict[str, Any]) -> None:
+    conn.execute(
+        "INSERT INTO alerts (ts_utc, event_ticker, outcome, kind, signal, edge, kalshi_mid, futures_prob, implied_post_rate, latency_ms) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            alert["ts_utc"],
+            alert["event_ticker"],
+            alert["outcome"],
+            alert["kind"],
+            alert["signal"],
+            alert.get("edge"),
+            alert.get("kalshi_mid"),
+            alert.get("futures_prob"),
+            alert.get("implied_post_rate"),
+            alert.get("latency_ms"),
+        ),
+    )
+    conn.commit()
+
+def load_series_catalog(conn: sqlite3.Connection) -> List[Tuple[str, str, str]]:
+    cur = conn.execute("SELECT ticker, COALESCE(title, ''), COALESCE(category, '') FROM series_catalog")
+    return cur.fetchall()
+
+def series_catalog_fetched_at(conn: sqlite3.Connection) -> Optional[str]:
+    row = conn.execute("SELECT MAX(fetched_at) FROM series_catalog").fetchone()
+    return row[0] if row else None
+
+def upsert_series(conn: sqlite3.Connection, ts_utc: str, rows: Iterable[Tuple[str, str, str]]) -> None:
+    # updated_at only moves when title/category actually change; fetched_at always does.
+    conn.executemany(
+        """
+        INSERT INTO series_catalog (ticker, title, category, updated_at, fetched_at) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(ticker) DO UPDATE SET
+            updated_at = CASE WHEN title IS NOT excluded.title OR category IS NOT excluded.category
+                              THEN excluded.updated_at ELSE updated_at END,
+            title = excluded.title,
+            category = excluded.category,
+            fetched_at = excluded.fetched_at
+        """,
+        [(t, title, cat, ts_utc, ts_utc) for t, title, cat in rows],
+    )
+    conn.commit()
+
+def delete_series(conn: sqlite3.Connection, tickers: Iterable[str]) -> None:
+    conn.executemany("DELETE FROM series_catalog WHERE ticker = ?", [(t,) for t in tickers])
+    conn.commit()
@@ -1,9 +1,17 @@
 # src/kalshi_discovery.py
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+import re
+import sqlite3
+import threading
 import requests
 
+from src import db as dbmod
+
 def _get_json(url: str, params: Optional[Dict[str, Any]] = None, timeout: int = 20) -> Dict[str, Any]:
     r = requests.get(url, params=params, timeout=timeout)
     r.raise_for_status()
@@ -13,57 +21,229 @@ def list_series(base_url: str) -> List[Dict[str, Any]]:
     data = _get_json(f"{base_url}/series")
     return data.get("series", [])
 
-def rank_fomc_series(base_url: str, top_n: int = 12) -> List[str]:
-    series = list_series(base_url)
-
-    all_tickers = []
-    for s in series:
-        t = (s.get("ticker") or "").strip()
-        if t:
-            all_tickers.append(t)
-
-    # Hard-pin the one we KNOW is the Fed decision series
-    pinned = []
-    if "KXFEDDECISION" in all_tickers:
-        pinned.append("KXFEDDECISION")
-
-    weights = {
-        "kxfeddecision": 999,     # if it appears in text anywhere, slam-dunk it
-        "fomc": 50,
-        "fed decision": 40,
-        "rate decision": 35,
-        "federal open market": 30,
-        "meeting": 20,
-        "decision": 20,
-        "target rate": 15,
-        "federal reserve": 10,
-        "fed funds": 10,
-        "interest rate": 8,
-        "policy rate": 8,
-        "kxfed": 25,              # favour tickers that look like KX Fed series
-    }
-
-    scored: List[Tuple[int, str]] = []
-    for s in series:
-        ticker = (s.get("ticker") or "").strip()
-        title = (s.get("title") or "").strip()
-        if not ticker:
-            continue
-
-        text = (title + " " + ticker).lower()
-        score = 0
-        for kw, w in weights.items():
-            if kw in text:
-                score += w
-
-        # extra boost for tickers that start with KXFED (often the macro series)
-        if ticker.lower().startswith("kxfed"):
-            score += 30
-
-        if score > 0:
-            scored.append((score, ticker))
-
-    scored.sort(key=lambda x: x[0], reverse=True)
-
-    ranked = pinned + [t for _, t in scored if t not in pinned]
-    return ranked[:top_n]
+FOMC_WEIGHTS: Dict[str, int] = {
+    "kxfeddecision": 999,     # if it appears in text anywhere, slam-dunk it
+    "fomc": 50,
+    "fed decision": 40,
+    "rate decision": 35,
+    "federal open market": 30,
+    "meeting": 20,
+    "decision": 20,
+    "target rate": 15,
+    "federal reserve": 10,
+    "fed funds": 10,
+    "interest rate": 8,
+    "policy rate": 8,
+    "kxfed": 25,              # favour tickers that look like KX Fed series
+}
+
+# extra boost for tickers that start with KXFED (often the macro series)
+FOMC_TICKER_PREFIX_BOOSTS: Dict[str, int] = {"kxfed": 30}
+
+# Hard-pin the one we KNOW is the Fed decision series
+FOMC_PINNED: Tuple[str, ...] = ("KXFEDDECISION",)
+
+WeightKey = Tuple[Tuple[str, int], ...]
+
+class KeywordMatcher:
+    """One compiled regex over all keywords; each keyword counts once per text, like `kw in text`.
+
+    Alternatives are tried longest first inside a lookahead, so the regex reports the
+    longest keyword starting at every position. Any shorter keyword starting at the
+    same position must be a prefix of that one, which `_prefixes` precomputes.
+    """
+
+    def __init__(self, weights: WeightKey):
+        self.weights = dict(weights)
+        kws = sorted((k for k in self.weights if k), key=len, reverse=True)
+        self._prefixes: Dict[str, FrozenSet[str]] = {
+            k: frozenset(p for p in kws if k.startswith(p)) for k in kws
+        }
+        self._re = re.compile("(?=(" + "|".join(re.escape(k) for k in kws) + "))") if kws else None
+
+    def matches(self, text: str) -> FrozenSet[str]:
+        if self._re is None:
+            return frozenset()
+        found: set = set()
+        for longest in self._re.findall(text.lower()):
+            found |= self._prefixes[longest]
+        return frozenset(found)
+
+    def score(self, text: str) -> int:
+        return sum(self.weights[k] for k in self.matches(text))
+
+@lru_cache(maxsize=64)
+def compile_keywords(weights: WeightKey) -> KeywordMatcher:
+    return KeywordMatcher(weights)
+
+def _weight_key(weights: Dict[str, int]) -> WeightKey:
+    return tuple(sorted((k.lower(), int(w)) for k, w in weights.items()))
+
+class SeriesCatalog:
+    """Local copy of Kalshi's `/series` list, persisted in SQLite and refreshed at most every `ttl`.
+
+    A failed refresh keeps serving the cached rows and is not retried for `retry_after`.
+
+    Scores are memoized per (keyword set, ticker) and ranked lists per query, so repeat
+    lookups are a dict hit; a refresh only invalidates tickers whose text changed, and
+    drops series Kalshi no longer lists. Both memos keep the `max_queries` most recent
+    keyword sets.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        conn: Optional[sqlite3.Connection] = None,
+        ttl: timedelta = timedelta(hours=6),
+        retry_after: timedelta = timedelta(minutes=5),
+        max_queries: int = 32,
+    ):
+        self.base_url = base_url
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.max_queries = max_queries
+        self.last_error: Optional[str] = None
+        self._retry_at: Optional[datetime] = None
+        self._conn = conn
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()   # single-flight /series downloads
+        self._series: Dict[str, str] = {}          # ticker -> searchable text
+        self._fetched_at: Optional[datetime] = None
+        self._scores: "OrderedDict[Tuple[WeightKey, WeightKey], Dict[str, int]]" = OrderedDict()
+        self._ranked: "OrderedDict[Tuple[WeightKey, WeightKey, Tuple[str, ...]], List[str]]" = OrderedDict()
+        if conn is not None:
+            dbmod.init(conn)
+            self._load(dbmod.load_series_catalog(conn))
+            fetched = dbmod.series_catalog_fetched_at(conn)
+            self._fetched_at = datetime.fromisoformat(fetched) if fetched else None
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def tickers(self) -> List[str]:
+        return list(self._series)
+
+    @staticmethod
+    def _text(ticker: str, title: str) -> str:
+        return (title + " " + ticker).lower()
+
+    def _evict(self, memo: "OrderedDict[Any, Any]") -> None:
+        while len(memo) > self.max_queries:
+            memo.popitem(last=False)
+
+    def _load(self, rows: List[Tuple[str, str, str]]) -> List[str]:
+        changed = []
+        for ticker, title, _category in rows:
+            text = self._text(ticker, title)
+            if self._series.get(ticker) != text:
+                self._series[ticker] = text
+                changed.append(ticker)
+        return changed
+
+    def is_stale(self, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(timezone.utc)
+        if self._retry_at is not None and now < self._retry_at:
+            return False
+        if self._fetched_at is None:
+            return True
+        return now - self._fetched_at >= self.ttl
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """Re-download the catalog if stale; returns tickers that are new, changed or removed.
+
+        Network/API errors are recorded in `last_error` rather than raised. Concurrent
+        callers queue behind one download and then find the catalog fresh.
+        """
+        if not force and not self.is_stale():
+            return []
+        with self._refresh_lock:
+            if not force and not self.is_stale():
+                return []
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> List[str]:
+        rows: List[Tuple[str, str, str]] = []
+        try:
+            for s in list_series(self.base_url):
+                ticker = (s.get("ticker") or "").strip()
+                if ticker:
+                    rows.append((ticker, (s.get("title") or "").strip(), (s.get("category") or "").strip()))
+        except Exception as e:
+            with self._lock:
+                self.last_error = f"series refresh failed: {e}"
+                self._retry_at = datetime.now(timezone.utc) + self.retry_after
+            return []
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self.last_error = None
+            self._retry_at = None
+            changed = self._load(rows)
+            # An empty listing is more likely an API hiccup than Kalshi delisting everything.
+            fetched = {t for t, _, _ in rows}
+            removed = [t for t in self._series if t not in fetched] if fetched else []
+            for t in removed:
+                del self._series[t]
+            self._fetched_at = now
+            stale = changed + removed
+            if stale:
+                for scores in self._scores.values():
+                    for t in stale:
+                        scores.pop(t, None)
+                self._ranked.clear()
+        if self._conn is not None:
+            dbmod.upsert_series(self._conn, now.isoformat(), rows)
+            if removed:
+                dbmod.delete_series(self._conn, removed)
+        return stale
+
+    def rank(
+        self,
+        weights: Dict[str, int],
+        top_n: int = 12,
+        prefix_boosts: Optional[Dict[str, int]] = None,
+        pinned: Tuple[str, ...] = (),
+    ) -> List[str]:
+        """Rank catalog tickers by keyword weights (substring match on title + ticker)."""
+        wkey = _weight_key(weights)
+        bkey = _weight_key(prefix_boosts or {})
+        rkey = (wkey, bkey, tuple(pinned))
+        with self._lock:
+            ranked = self._ranked.get(rkey)
+            if ranked is not None:
+                self._ranked.move_to_end(rkey)
+            else:
+                scores = self._scores.get((wkey, bkey))
+                if scores is None:
+                    scores = self._scores[(wkey, bkey)] = {}
+                    self._evict(self._scores)
+                else:
+                    self._scores.move_to_end((wkey, bkey))
+                matcher = compile_keywords(wkey)
+                for ticker, text in self._series.items():
+                    if ticker not in scores:
+                        score = matcher.score(text)
+                        tl = ticker.lower()
+                        for prefix, boost in bkey:
+                            if tl.startswith(prefix):
+                                score += boost
+                        scores[ticker] = score
+                # Ties break on ticker so the order never depends on refresh/load history.
+                scored = sorted(((v, t) for t, v in scores.items() if v > 0), key=lambda x: (-x[0], x[1]))
+                pins = [t for t in pinned if t in self._series]
+                ranked = pins + [t for _, t in scored if t not in pins]
+                self._ranked[rkey] = ranked
+                self._evict(self._ranked)
+        return ranked[:top_n]
+
+    def rank_fomc(self, top_n: int = 12) -> List[str]:
+        return self.rank(FOMC_WEIGHTS, top_n=top_n, prefix_boosts=FOMC_TICKER_PREFIX_BOOSTS, pinned=FOMC_PINNED)
+
+_CATALOGS: Dict[str, SeriesCatalog] = {}
+
+def rank_fomc_series(base_url: str, top_n: int = 12, catalog: Optional[SeriesCatalog] = None) -> List[str]:
+    if catalog is None:
+        catalog = _CATALOGS.get(base_url)
+        if catalog is None:
+            catalog = _CATALOGS[base_url] = SeriesCatalog(base_url)
+    catalog.refresh()
+    return catalog.rank_fomc(top_n=top_n)
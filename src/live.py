@@ -0,0 +1,207 @@
+# src/live.py
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+import threading
+import time
+
+from src.config import Config
+from src.fomc_calendar import FomcMeeting, get_upcoming_meeting
+from src.futures_client import FuturesQuote, fed_funds_futures_symbol, fetch_quotes
+from src.kalshi_client import (
+    KalshiMarket,
+    list_events,
+    choose_event_for_date,
+    get_event_with_markets,
+    parse_markets,
+    classify_fed_decision_market_title,
+)
+from src.model import FuturesImpliedProbs, futures_to_probs, kalshi_probs_to_action_buckets
+from src.signals import DbSink, LocalWebhookStub, QueueSink, SignalEngine, SignalParams, WebhookSink
+from src.tick_buffer import TickHistory
+
+@dataclass(frozen=True)
+class KalshiSnapshot:
+    series_ticker: str
+    event_ticker: str
+    event_title: str
+    probs: Dict[Tuple[str, int], float]
+    markets: List[KalshiMarket]
+    fetched_at: float   # unix seconds when the markets response came back
+    arrived: float      # time.perf_counter() at the same moment, for latency
+
+def resolve_event(base_url: str, series_ticker: str, target_date: date) -> Tuple[str, str]:
+    events = list_events(base_url, series_ticker=series_ticker, status=None)
+    return choose_event_for_date(events, target=target_date)
+
+def fetch_kalshi_snapshot(base_url: str, series_ticker: str, event_ticker: str, event_title: str) -> KalshiSnapshot:
+    payload = get_event_with_markets(base_url, event_ticker=event_ticker)
+    arrived = time.perf_counter()
+    fetched_at = time.time()
+    markets = parse_markets(payload)
+    probs: Dict[Tuple[str, int], float] = {}
+    for m in markets:
+        cls = classify_fed_decision_market_title(m.title)
+        p = m.mid_prob
+        if cls is not None and p is not None:
+            probs[cls] = p
+    return KalshiSnapshot(series_ticker, event_ticker, event_title, probs, markets, fetched_at, arrived)
+
+def compare_probs(kalshi_probs_raw: Dict[Tuple[str, int], float], fut_probs: Dict[str, float]) -> Dict[str, Tuple[float, float]]:
+    # outcome -> (kalshi, futures); a side missing an outcome counts as 0, like the app's outer join
+    kalshi = kalshi_probs_to_action_buckets(kalshi_probs_raw)
+    outcomes = list(kalshi) + [k for k in fut_probs if k not in kalshi]
+    return {k: (float(kalshi.get(k, 0.0)), float(fut_probs.get(k, 0.0))) for k in outcomes}
+
+@dataclass(frozen=True)
+class LiveSnapshot:
+    """Everything one poll used, so the page can render it instead of re-fetching."""
+
+    meeting: FomcMeeting
+    effective_from: date
+    futures_year: int
+    futures_month: int
+    meeting_symbol: str
+    prior_symbol: str
+    rate_step: float
+    kalshi: KalshiSnapshot
+    quotes: Dict[str, FuturesQuote]
+    fut: FuturesImpliedProbs
+
+class LiveService:
+    """Polls quotes on a daemon thread and feeds TickHistory -> SignalEngine -> sinks.
+
+    Runs once per server process, whether or not anyone has the page open. It tracks
+    the next FOMC meeting for `cfg.kalshi_series_ticker`; alert settings come from
+    `cfg` and are shared by every viewer. Alerts go to `alert_queue` (drain it or
+    block on `get`), the `alerts` table and the webhook.
+
+    `latest` is the last poll's inputs and quotes; it is swapped under `history.lock`
+    together with that poll's ticks, so readers holding the lock see both consistently.
+    """
+
+    def __init__(self, cfg: Config):
+        self.cfg = cfg
+        self.history = TickHistory(capacity=4096)
+        self.webhook_stub = LocalWebhookStub()
+        self.alert_queue = QueueSink()
+        if cfg.alert_webhook_url:
+            webhook = WebhookSink(cfg.alert_webhook_url)
+        else:
+            webhook = WebhookSink("stub://local", post=self.webhook_stub.post)
+        self.engine = SignalEngine(
+            params=SignalParams(
+                entry_threshold=cfg.edge_threshold,
+                exit_threshold=min(cfg.alert_exit_threshold, cfg.edge_threshold),
+                min_persist_ticks=cfg.alert_min_persist_ticks,
+                cooldown_s=cfg.alert_cooldown_s,
+                latency_budget_ms=cfg.alert_latency_budget_ms,
+            ),
+            sinks=[self.alert_queue, DbSink(cfg.sqlite_path), webhook],
+        )
+        self.history.subscribe("signals", self.engine.on_tick)
+
+        self.errors: Deque[str] = deque(maxlen=50)
+        self.event_ticker: Optional[str] = None
+        self.latest: Optional[LiveSnapshot] = None
+        self.last_poll_utc: Optional[datetime] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._meeting: Optional[Tuple[date, FomcMeeting]] = None
+        self._event: Optional[Tuple[date, str, str]] = None
+        self._futures: Optional[Tuple[float, Tuple[str, str], Dict[str, FuturesQuote], FuturesImpliedProbs]] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="quote-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.errors.append(f"{datetime.now(timezone.utc).isoformat()} {e}")
+            self._stop.wait(self.cfg.poll_interval_s)
+
+    def _next_meeting(self) -> FomcMeeting:
+        today = datetime.now(timezone.utc).date()
+        if self._meeting is None or self._meeting[0] != today:
+            self._meeting = (today, get_upcoming_meeting(today=today))
+        return self._meeting[1]
+
+    def _event_for(self, meeting: FomcMeeting) -> Tuple[str, str]:
+        if self._event is None or self._event[0] != meeting.end_date:
+            ticker, title = resolve_event(self.cfg.kalshi_base_url, self.cfg.kalshi_series_ticker, meeting.end_date)
+            self._event = (meeting.end_date, ticker, title)
+            self._futures = None
+        return self._event[1], self._event[2]
+
+    def _futures_probs(
+        self, meeting: FomcMeeting
+    ) -> Tuple[Tuple[str, str], Dict[str, FuturesQuote], FuturesImpliedProbs]:
+        # Futures are daily closes, so they are re-polled far less often than Kalshi.
+        now = time.time()
+        if self._futures is not None and now - self._futures[0] < self.cfg.futures_poll_interval_s:
+            return self._futures[1:]
+        y, m = meeting.year, meeting.month
+        prior_y, prior_m = (y - 1, 12) if m == 1 else (y, m - 1)
+        symbols = (fed_funds_futures_symbol(y, m), fed_funds_futures_symbol(prior_y, prior_m))
+        quotes: Dict[str, FuturesQuote] = fetch_quotes({"meeting_month": symbols[0], "prior_month": symbols[1]})
+        meeting_avg = quotes["meeting_month"].implied_month_avg_rate
+        prior_avg = quotes["prior_month"].implied_month_avg_rate
+        if meeting_avg is None or prior_avg is None:
+            raise RuntimeError(
+                f"Missing futures prices: {quotes['meeting_month'].error or ''} {quotes['prior_month'].error or ''}".strip()
+            )
+        fut = futures_to_probs(
+            month_avg_rate=float(meeting_avg),
+            pre_rate_mid=float(prior_avg),
+            meeting_month_year=y,
+            meeting_month=m,
+            effective_from=meeting.end_date + timedelta(days=1),
+            step=self.cfg.rate_step,
+        )
+        self._futures = (now, symbols, quotes, fut)
+        return symbols, quotes, fut
+
+    def poll_once(self) -> None:
+        meeting = self._next_meeting()
+        event_ticker, event_title = self._event_for(meeting)
+        symbols, quotes, fut = self._futures_probs(meeting)
+        snap = fetch_kalshi_snapshot(self.cfg.kalshi_base_url, self.cfg.kalshi_series_ticker, event_ticker, event_title)
+        with self.history.lock:
+            self.event_ticker = event_ticker
+            for outcome, (kalshi_mid, futures_prob) in compare_probs(snap.probs, fut.probs).items():
+                self.history.record(
+                    snap.fetched_at,
+                    event_ticker,
+                    outcome,
+                    kalshi_mid=kalshi_mid,
+                    futures_prob=futures_prob,
+                    implied_post_rate=fut.implied_post_rate,
+                    quote_ts=snap.fetched_at,
+                    arrived=snap.arrived,
+                )
+            self.latest = LiveSnapshot(
+                meeting=meeting,
+                effective_from=meeting.end_date + timedelta(days=1),
+                futures_year=meeting.year,
+                futures_month=meeting.month,
+                meeting_symbol=symbols[0],
+                prior_symbol=symbols[1],
+                rate_step=self.cfg.rate_step,
+                kalshi=snap,
+                quotes=quotes,
+                fut=fut,
+            )
+        self.last_poll_utc = datetime.now(timezone.utc)
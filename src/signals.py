@@ -0,0 +1,251 @@
+# src/signals.py
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+import queue
+import threading
+import time
+import requests
+
+from src import db as dbmod
+from src.tick_buffer import TickBuffer, TickKey
+
+CHEAP = "Kalshi looks cheap"
+RICH = "Kalshi looks rich"
+
+@dataclass(frozen=True)
+class SignalParams:
+    # Enter when |edge| > entry_threshold, leave only once |edge| < exit_threshold (or it flips sign).
+    entry_threshold: float = 0.03
+    exit_threshold: float = 0.015
+    min_persist_ticks: int = 1
+    cooldown_s: float = 60.0
+    latency_budget_ms: float = 100.0
+
+@dataclass(frozen=True)
+class Alert:
+    ts_utc: str
+    event_ticker: str
+    outcome: str
+    kind: str          # ENTER / EXIT
+    signal: str        # CHEAP / RICH text
+    edge: float
+    kalshi_mid: float
+    futures_prob: float
+    implied_post_rate: float
+    latency_ms: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+@dataclass
+class _OutcomeState:
+    active: Optional[str] = None
+    last_enter_ts: Optional[float] = None
+
+# --- sinks ---
+
+class QueueSink:
+    """Bounded in-process queue for local consumers; drops the oldest alert rather than blocking ticks."""
+
+    def __init__(self, maxsize: int = 1000):
+        self.queue: "queue.Queue[Alert]" = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def emit(self, alert: Alert) -> None:
+        while True:
+            try:
+                self.queue.put_nowait(alert)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Alert]:
+        # Blocks up to `timeout` seconds (forever if None); None when nothing arrived.
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self) -> List[Alert]:
+        out: List[Alert] = []
+        while True:
+            try:
+                out.append(self.queue.get_nowait())
+            except queue.Empty:
+                return out
+
+class _ThreadedSink(ABC):
+    """Hands alerts to a background worker so slow I/O never runs on the tick path."""
+
+    name = "alert-sink"
+
+    def __init__(self, maxsize: int = 1000):
+        self.errors: Deque[str] = deque(maxlen=50)
+        self._pending: "queue.Queue[Alert]" = queue.Queue(maxsize=maxsize)
+        self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._worker.start()
+
+    def emit(self, alert: Alert) -> None:
+        try:
+            self._pending.put_nowait(alert)
+        except queue.Full:
+            self.errors.append(f"dropped alert for {alert.outcome}: {self.name} queue full")
+
+    @abstractmethod
+    def _deliver(self, alert: Alert) -> None:
+        ...
+
+    def _run(self) -> None:
+        while True:
+            alert = self._pending.get()
+            try:
+                self._deliver(alert)
+            except Exception as e:
+                self.errors.append(f"{self.name}: {e}")
+
+class DbSink(_ThreadedSink):
+    """Writes alerts to the `alerts` table on its own connection."""
+
+    name = "db-sink"
+
+    def __init__(self, sqlite_path: str, maxsize: int = 1000):
+        self._conn = dbmod.connect(sqlite_path)
+        dbmod.init(self._conn)
+        super().__init__(maxsize=maxsize)
+
+    def _deliver(self, alert: Alert) -> None:
+        dbmod.insert_alert(self._conn, alert.as_dict())
+
+class LocalWebhookStub:
+    """Stands in for `requests.post` so the webhook path runs without a real endpoint."""
+
+    @dataclass(frozen=True)
+    class _Response:
+        status_code: int = 200
+
+    def __init__(self, maxlen: int = 500):
+        self.received: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+
+    def post(self, url: str, json: Optional[Dict[str, Any]] = None, timeout: float = 0) -> "LocalWebhookStub._Response":
+        self.received.append({"url": url, "json": json})
+        return self._Response()
+
+class WebhookSink(_ThreadedSink):
+    """POSTs alerts as JSON to `url`."""
+
+    name = "webhook-sink"
+
+    def __init__(
+        self,
+        url: str,
+        post: Callable[..., Any] = requests.post,
+        timeout: float = 5.0,
+        maxsize: int = 1000,
+    ):
+        self.url = url
+        self.timeout = timeout
+        self._post = post
+        super().__init__(maxsize=maxsize)
+
+    def _deliver(self, alert: Alert) -> None:
+        r = self._post(self.url, json=alert.as_dict(), timeout=self.timeout)
+        status = getattr(r, "status_code", 200)
+        if status >= 400:
+            raise RuntimeError(f"{self.url}: HTTP {status}")
+
+# --- engine ---
+
+@dataclass
+class SignalEngine:
+    """Evaluates each outcome's edge as its tick lands, with hysteresis, persistence and cooldown.
+
+    Subscribe `on_tick` to a TickHistory; alerts go to every sink and to `recent`.
+    `latency_ms` is quote arrival -> alert handed to the sinks; sinks only enqueue, so
+    that is the whole synchronous path. A failing sink is logged in `sink_errors` and
+    never stops the others.
+    """
+
+    params: SignalParams = field(default_factory=SignalParams)
+    sinks: List[Any] = field(default_factory=list)
+    recent: Deque[Alert] = field(default_factory=lambda: deque(maxlen=200))
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=500))
+    sink_errors: Deque[str] = field(default_factory=lambda: deque(maxlen=50))
+    over_budget: int = 0
+
+    def __post_init__(self) -> None:
+        self._state: Dict[TickKey, _OutcomeState] = {}
+        self._lock = threading.Lock()
+
+    def active(self) -> Dict[TickKey, str]:
+        with self._lock:
+            return {k: s.active for k, s in self._state.items() if s.active is not None}
+
+    def on_tick(self, key: TickKey, buf: TickBuffer, arrived: float) -> Optional[Alert]:
+        with self._lock:
+            alert = self._evaluate(key, buf, arrived)
+            if alert is None:
+                return None
+            self.recent.append(alert)
+            self.latencies_ms.append(alert.latency_ms)
+            if alert.latency_ms > self.params.latency_budget_ms:
+                self.over_budget += 1
+            for sink in list(self.sinks):
+                try:
+                    sink.emit(alert)
+                except Exception as e:
+                    self.sink_errors.append(f"{type(sink).__name__}: {e}")
+            return alert
+
+    def _evaluate(self, key: TickKey, buf: TickBuffer, arrived: float) -> Optional[Alert]:
+        tick = buf.last()
+        if tick is None:
+            return None
+        p = self.params
+        edge = float(tick["edge"])
+        ts = float(tick["ts"])
+        state = self._state.setdefault(key, _OutcomeState())
+
+        if state.active is not None:
+            side_edge = edge if state.active == CHEAP else -edge
+            if side_edge < p.exit_threshold:
+                signal, state.active = state.active, None
+                return self._alert(key, "EXIT", signal, tick, arrived)
+            return None
+
+        if edge > p.entry_threshold:
+            signal = CHEAP
+        elif edge < -p.entry_threshold:
+            signal = RICH
+        else:
+            return None
+        if not buf.persisted(p.entry_threshold, p.min_persist_ticks):
+            return None
+        if state.last_enter_ts is not None and ts - state.last_enter_ts < p.cooldown_s:
+            return None
+        state.active = signal
+        state.last_enter_ts = ts
+        return self._alert(key, "ENTER", signal, tick, arrived)
+
+    @staticmethod
+    def _alert(key: TickKey, kind: str, signal: str, tick: Any, arrived: float) -> Alert:
+        return Alert(
+            ts_utc=datetime.fromtimestamp(float(tick["ts"]), timezone.utc).isoformat(),
+            event_ticker=key[0],
+            outcome=key[1],
+            kind=kind,
+            signal=signal,
+            edge=float(tick["edge"]),
+            kalshi_mid=float(tick["kalshi_mid"]),
+            futures_prob=float(tick["futures_prob"]),
+            implied_post_rate=float(tick["implied_post_rate"]),
+            latency_ms=(time.perf_counter() - arrived) * 1000.0,
+        )
@@ -0,0 +1,166 @@
+# src/tick_buffer.py
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple
+import threading
+import time
+import numpy as np
+
+TICK_DTYPE = np.dtype(
+    [
+        ("ts", "f8"),                 # unix seconds (UTC)
+        ("kalshi_mid", "f8"),
+        ("futures_prob", "f8"),
+        ("edge", "f8"),               # futures - kalshi
+        ("implied_post_rate", "f8"),
+    ]
+)
+
+class TickBuffer:
+    """Fixed-size ring buffer of recent ticks for one outcome.
+
+    Every tick is written twice (slot i and i + capacity), so the most recent
+    n ticks are always one contiguous slice and `window` never copies.
+    """
+
+    def __init__(self, capacity: int = 2048):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        self.capacity = int(capacity)
+        self._data = np.zeros(2 * self.capacity, dtype=TICK_DTYPE)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(
+        self,
+        ts: float,
+        kalshi_mid: float,
+        futures_prob: float,
+        edge: float,
+        implied_post_rate: float,
+    ) -> None:
+        i = self._count % self.capacity
+        row = (ts, kalshi_mid, futures_prob, edge, implied_post_rate)
+        self._data[i] = row
+        self._data[i + self.capacity] = row
+        self._count += 1
+
+    def window(self, n: Optional[int] = None) -> np.ndarray:
+        # Zero-copy view of the last n ticks, oldest first.
+        size = len(self)
+        n = size if n is None else max(0, min(int(n), size))
+        end = (self._count - 1) % self.capacity + 1 + self.capacity if self._count else 0
+        return self._data[end - n:end]
+
+    def field(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        return self.window(n)[name]
+
+    def last(self) -> Optional[np.void]:
+        if not self._count:
+            return None
+        return self.window(1)[0]
+
+    def rolling_mean(self, name: str = "edge", window: int = 20) -> np.ndarray:
+        x = self.field(name)
+        if window <= 0 or len(x) < window:
+            return np.empty(0, dtype="f8")
+        return np.lib.stride_tricks.sliding_window_view(x, window).mean(axis=1)
+
+    def rolling_std(self, name: str = "edge", window: int = 20) -> np.ndarray:
+        x = self.field(name)
+        if window <= 1 or len(x) < window:
+            return np.empty(0, dtype="f8")
+        return np.lib.stride_tricks.sliding_window_view(x, window).std(axis=1, ddof=1)
+
+    def zscore(self, name: str = "edge", window: int = 20) -> np.ndarray:
+        # z of each tick against its own trailing window (inclusive).
+        mean = self.rolling_mean(name, window)
+        std = self.rolling_std(name, window)
+        if not len(mean):
+            return mean
+        x = self.field(name)[window - 1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (x - mean) / std
+        z[~np.isfinite(z)] = 0.0
+        return z
+
+    def persisted(self, threshold: float, n: int) -> bool:
+        # True if the last n edges all sit beyond +threshold, or all beyond -threshold.
+        if n <= 0:
+            return True
+        if len(self) < n:
+            return False
+        edges = self.field("edge", n)
+        return bool(np.all(edges > threshold) or np.all(edges < -threshold))
+
+# (event_ticker, outcome): different meetings/series never share a buffer
+TickKey = Tuple[str, str]
+
+# listener(key, buffer, arrived) where arrived is the time.perf_counter() at which the quote landed
+TickListener = Callable[[TickKey, TickBuffer, float], None]
+
+class TickHistory:
+    """One TickBuffer per (event_ticker, outcome), e.g. ("KXFEDDECISION-25JAN", "HOLD").
+
+    `record` is serialized by `lock`; hold it as well when reading a buffer that
+    another thread may be appending to.
+    """
+
+    def __init__(self, capacity: int = 2048):
+        self.capacity = int(capacity)
+        self.buffers: Dict[TickKey, TickBuffer] = {}
+        self.lock = threading.RLock()
+        self._last_quote: Dict[TickKey, float] = {}
+        self._listeners: Dict[str, TickListener] = {}
+
+    def __getitem__(self, key: TickKey) -> TickBuffer:
+        with self.lock:
+            buf = self.buffers.get(key)
+            if buf is None:
+                buf = self.buffers[key] = TickBuffer(self.capacity)
+            return buf
+
+    def outcomes(self, event_ticker: str) -> List[str]:
+        with self.lock:
+            return [o for e, o in self.buffers if e == event_ticker]
+
+    def subscribe(self, key: str, listener: TickListener) -> None:
+        # Keyed so re-subscribing the same consumer replaces it instead of stacking.
+        with self.lock:
+            self._listeners[key] = listener
+
+    def unsubscribe(self, key: str) -> None:
+        with self.lock:
+            self._listeners.pop(key, None)
+
+    def record(
+        self,
+        ts: float,
+        event_ticker: str,
+        outcome: str,
+        kalshi_mid: float,
+        futures_prob: float,
+        implied_post_rate: float,
+        quote_ts: Optional[float] = None,
+        arrived: Optional[float] = None,
+    ) -> Optional[TickBuffer]:
+        """Append one tick and notify listeners; returns None if `quote_ts` was already recorded.
+
+        `quote_ts` identifies the underlying quote (e.g. when it was fetched), so replaying
+        the same cached quote does not add a tick. `arrived` defaults to now.
+        """
+        if arrived is None:
+            arrived = time.perf_counter()
+        key = (event_ticker, outcome)
+        with self.lock:
+            if quote_ts is not None:
+                if self._last_quote.get(key) == quote_ts:
+                    return None
+                self._last_quote[key] = quote_ts
+            buf = self[key]
+            buf.append(ts, kalshi_mid, futures_prob, futures_prob - kalshi_mid, implied_post_rate)
+            for listener in list(self._listeners.values()):
+                listener(key, buf, arrived)
+            return buf